@@ -1,5 +1,6 @@
 import asyncio
 import json
+import logging
 from typing import Any, Optional
 
 from aidial_client import AsyncDial
@@ -8,9 +9,12 @@ from aidial_sdk.chat_completion import Message, Role, Choice, Request, Response,
 from task.tools.base_tool import BaseTool
 from task.tools.models import ToolCallParams
 from task.utils.constants import TOOL_CALL_HISTORY_KEY
+from task.utils.dial_client import API_VERSION, get_dial_client
 from task.utils.history import unpack_messages
 from task.utils.stage import StageProcessor
 
+log = logging.getLogger(__name__)
+
 
 class BaseAgent:
 
@@ -38,17 +42,14 @@ class BaseAgent:
             request: Request,
             response: Response
     ) -> Message:
-        client: AsyncDial = AsyncDial(
-            base_url=self.endpoint,
-            api_key=request.api_key,
-            api_version='2025-01-01-preview'
-        )
+        client: AsyncDial = get_dial_client(self.endpoint, request.api_key)
 
         chunks = await client.chat.completions.create(
             messages=self._prepare_messages(request.messages),
             tools=[tool.schema for tool in self.tools],
             stream=True,
             deployment_name=deployment_name,
+            api_version=API_VERSION,
         )
 
         tool_call_index_map = {}
@@ -114,11 +115,9 @@ class BaseAgent:
             }
         )
 
-        print("\nHistory:")
-        for msg in unpacked_messages:
-            print(f"     {json.dumps(msg)}")
-
-        print(f"{'-' * 100}\n")
+        # History is serialized only when debug logging is enabled, it is too expensive for every request
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("History:\n%s", "\n".join(f"     {json.dumps(msg)}" for msg in unpacked_messages))
 
         return unpacked_messages
 
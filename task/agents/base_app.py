@@ -0,0 +1,81 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import AsyncContextManager, Callable
+
+from aidial_sdk import DIALApp
+from aidial_sdk.chat_completion import ChatCompletion
+from starlette.middleware.gzip import GZipMiddleware
+
+from task.tools.base_tool import BaseTool
+from task.utils.dial_client import close_dial_clients
+
+log = logging.getLogger(__name__)
+
+
+class BaseAgentApplication(ChatCompletion, ABC):
+    """Agent application with tools that are created once, on startup or on the first request."""
+
+    def __init__(self):
+        self.tools: list[BaseTool] = []
+        self._init_done = False
+        self._init_lock = asyncio.Lock()
+
+    async def init_tools(self) -> None:
+        # Tools are created once, the lock prevents concurrent first requests from creating them twice
+        if self._init_done:
+            return
+        async with self._init_lock:
+            if not self._init_done:
+                self.tools = await self._create_tools()
+                self._init_done = True
+
+    @abstractmethod
+    async def _create_tools(self) -> list[BaseTool]:
+        pass
+
+
+def create_lifespan(agent_app: BaseAgentApplication) -> Callable[[DIALApp], AsyncContextManager[None]]:
+    @asynccontextmanager
+    async def lifespan(_: DIALApp):
+        # Connect to MCP on startup, so the first request doesn't wait for it. If MCP is not available yet, tools will
+        # be created on the first request. Tools are created in a separate task, since on connection failure MCP
+        # client cancels the task it was created in. `asyncio.wait` doesn't raise the task result, so cancellation
+        # of the lifespan itself (e.g. shutdown during startup) is still propagated
+        task = asyncio.create_task(agent_app.init_tools())
+        try:
+            await asyncio.wait({task})
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+
+        if task.cancelled():
+            log.warning("Could not create tools on startup: tools creation was cancelled")
+        elif e := task.exception():
+            log.warning("Could not create tools on startup: %s", e, exc_info=e)
+
+        yield
+        await close_dial_clients()
+
+    return lifespan
+
+
+@asynccontextmanager
+async def _shutdown_lifespan(_: DIALApp):
+    yield
+    await close_dial_clients()
+
+
+def create_dial_app(deployment_name: str, impl: ChatCompletion) -> DIALApp:
+    """
+    Creates DIALApp with the agent application. Tools of `BaseAgentApplication` are created on startup, DIAL clients
+    are closed on shutdown.
+    """
+    lifespan = create_lifespan(impl) if isinstance(impl, BaseAgentApplication) else _shutdown_lifespan
+    app = DIALApp(lifespan=lifespan)
+    # SSE responses (`text/event-stream`) are excluded by GZipMiddleware (since Starlette 0.46, pinned in
+    # requirements), so streaming isn't buffered
+    app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+    app.add_chat_completion(deployment_name=deployment_name, impl=impl)
+    return app
@@ -1,23 +1,26 @@
+import logging
 import os
 
 import uvicorn
-from aidial_sdk import DIALApp
-from aidial_sdk.chat_completion import ChatCompletion, Request, Response
+from aidial_sdk.chat_completion import Request, Response
 
+from task.agents.base_app import BaseAgentApplication, create_dial_app
 from task.agents.calculations.calculations_agent import CalculationsAgent
 from task.agents.calculations.tools.simple_calculator_tool import SimpleCalculatorTool
 from task.tools.base_tool import BaseTool
 from task.agents.calculations.tools.py_interpreter.python_code_interpreter_tool import PythonCodeInterpreterTool
+from task.tools.deployment.base_agent_tool import get_agent_tool
 from task.tools.deployment.content_management_agent_tool import ContentManagementAgentTool
 from task.tools.deployment.web_search_agent_tool import WebSearchAgentTool
 from task.utils.constants import DIAL_ENDPOINT, DEPLOYMENT_NAME
+from task.utils.log import configure_logging
 
+configure_logging()
+log = logging.getLogger(__name__)
 
-# 1. Create CalculationsApplication class and extend ChatCompletion
-class CalculationsApplication(ChatCompletion):
 
-    def __init__(self):
-        self.tools: list[BaseTool] = []
+# 1. Create CalculationsApplication class and extend ChatCompletion
+class CalculationsApplication(BaseAgentApplication):
 
     # 2. As a tools for CalculationsAgent you need to provide:
     #   - SimpleCalculatorTool
@@ -26,11 +29,11 @@ class CalculationsApplication(ChatCompletion):
     #   - WebSearchAgentTool (MAS Mesh)
     async def _create_tools(self) -> list[BaseTool]:
         py_interpreter_mcp_url = os.getenv('PYINTERPRETER_MCP_URL', "http://localhost:8050/mcp")
-        print(f"PYINTERPRETER_MCP_URL {py_interpreter_mcp_url}")
+        log.info("PYINTERPRETER_MCP_URL %s", py_interpreter_mcp_url)
 
         tools: list[BaseTool] = [
-            ContentManagementAgentTool(DIAL_ENDPOINT),
-            WebSearchAgentTool(DIAL_ENDPOINT),
+            get_agent_tool(ContentManagementAgentTool, DIAL_ENDPOINT),
+            get_agent_tool(WebSearchAgentTool, DIAL_ENDPOINT),
             SimpleCalculatorTool(),
             await PythonCodeInterpreterTool.create(
                 mcp_url=py_interpreter_mcp_url,
@@ -42,8 +45,7 @@ class CalculationsApplication(ChatCompletion):
 
     # 3. Override the chat_completion method of ChatCompletion, create Choice and call CalculationsAgent
     async def chat_completion(self, request: Request, response: Response) -> None:
-        if not self.tools:
-            self.tools = await self._create_tools()
+        await self.init_tools()
 
         with response.create_single_choice() as choice:
             await CalculationsAgent(
@@ -58,9 +60,10 @@ class CalculationsApplication(ChatCompletion):
 
 # 4. Create DIALApp with deployment_name `calculations-agent` (the same as in the core config) and impl is instance of
 #    the CalculationsApplication
-app: DIALApp = DIALApp()
 agent_app = CalculationsApplication()
-app.add_chat_completion(deployment_name="calculations-agent", impl=agent_app)
+
+
+app = create_dial_app(deployment_name="calculations-agent", impl=agent_app)
 
 # 5. Add starter with DIALApp, port is 5001 (see core config)
 if __name__ == "__main__":
@@ -1,7 +1,8 @@
 import base64
-import json
+import logging
 from typing import Any, Optional
 
+import orjson
 from aidial_client import Dial
 from aidial_sdk.chat_completion import Message, Attachment
 from pydantic import StrictStr, AnyUrl
@@ -12,6 +13,8 @@ from task.tools.mcp.mcp_client import MCPClient
 from task.tools.mcp.mcp_tool_model import MCPToolModel
 from task.tools.models import ToolCallParams, ToolStageConfig
 
+log = logging.getLogger(__name__)
+
 
 class PythonCodeInterpreterTool(BaseTool):
 
@@ -70,7 +73,7 @@ class PythonCodeInterpreterTool(BaseTool):
         return self._code_execute_tool.parameters
 
     async def _execute(self, tool_call_params: ToolCallParams) -> str | Message:
-        arguments = json.loads(tool_call_params.tool_call.function.arguments)
+        arguments = orjson.loads(tool_call_params.tool_call.function.arguments)
         stage = tool_call_params.stage
 
         stage.append_content("## Request arguments: \n")
@@ -85,7 +88,7 @@ class PythonCodeInterpreterTool(BaseTool):
         stage.append_content("## Response: \n")
 
         content = await self._mcp_client.call_tool(self.name, arguments)
-        execution_result_json = json.loads(content)
+        execution_result_json = orjson.loads(content)
         execution_result = _ExecutionResult.model_validate(execution_result_json)
 
         if execution_result.files:
@@ -107,7 +110,7 @@ class PythonCodeInterpreterTool(BaseTool):
                     file_data = base64.b64decode(resource)
 
                 url = f"files/{(files_home / name).as_posix()}"
-                print(url)
+                log.info("Uploading generated file to %s", url)
 
                 dial_client.files.upload(url=url, file=file_data)
 
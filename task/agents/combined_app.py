@@ -0,0 +1,55 @@
+import os
+from contextlib import AsyncExitStack, asynccontextmanager
+
+import uvicorn
+from fastapi import FastAPI
+
+
+def create_app() -> FastAPI:
+    """
+    Creates the app with all the agents mounted, each agent is mounted with its deployment name as prefix, e.g.
+    `/calculations-agent/openai/deployments/calculations-agent/chat/completions`.
+    Agents share tools, DIAL clients and HTTP connection pool within one worker process. Agent modules are imported
+    here, so uvicorn supervisor (`factory=True`) doesn't load them, only workers do.
+    """
+    from task.agents.calculations.calculations_app import app as calculations_app
+    from task.agents.content_management.content_management_app import app as content_management_app
+    from task.agents.web_search.web_search_app import app as web_search_app
+
+    agent_apps = {
+        "/calculations-agent": calculations_app,
+        "/content-management-agent": content_management_app,
+        "/web-search-agent": web_search_app,
+    }
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI):
+        # Lifespan of mounted apps is not run by Starlette, so startup and shutdown of agent apps are run here
+        async with AsyncExitStack() as stack:
+            for agent_app in agent_apps.values():
+                await stack.enter_async_context(agent_app.router.lifespan_context(agent_app))
+            yield
+
+    app = FastAPI(lifespan=lifespan)
+    for prefix, agent_app in agent_apps.items():
+        app.mount(prefix, agent_app)
+    return app
+
+
+if __name__ == "__main__":
+    import sys
+
+    if 'pydevd' in sys.modules:
+        config = uvicorn.Config(create_app(), port=5000, host="0.0.0.0", log_level="info")
+        server = uvicorn.Server(config)
+        import asyncio
+        asyncio.run(server.serve())
+    else:
+        uvicorn.run(
+            "task.agents.combined_app:create_app",
+            factory=True,
+            port=5000,
+            host="0.0.0.0",
+            workers=os.cpu_count(),
+            log_level="info",
+        )
@@ -1,15 +1,19 @@
 import uvicorn
-from aidial_sdk import DIALApp
 from aidial_sdk.chat_completion import ChatCompletion, Request, Response
 
+from task.agents.base_app import create_dial_app
 from task.agents.content_management.content_management_agent import ContentManagementAgent
 from task.agents.content_management.tools.files.file_content_extraction_tool import FileContentExtractionTool
-from task.agents.content_management.tools.rag.document_cache import DocumentCache
+from task.agents.content_management.tools.rag.document_cache import get_document_cache
 from task.agents.content_management.tools.rag.rag_tool import RagTool
 from task.tools.base_tool import BaseTool
+from task.tools.deployment.base_agent_tool import get_agent_tool
 from task.tools.deployment.calculations_agent_tool import CalculationsAgentTool
 from task.tools.deployment.web_search_agent_tool import WebSearchAgentTool
 from task.utils.constants import DIAL_ENDPOINT, DEPLOYMENT_NAME
+from task.utils.log import configure_logging
+
+configure_logging()
 
 # 1. Create ContentManagementApplication class and extend ChatCompletion
 class GeneralPurposeAgentApplication(ChatCompletion):
@@ -25,10 +29,10 @@ class GeneralPurposeAgentApplication(ChatCompletion):
             RagTool(
                 endpoint=DIAL_ENDPOINT,
                 deployment_name=DEPLOYMENT_NAME,
-                document_cache=DocumentCache.create()
+                document_cache=get_document_cache()
             ),
-            CalculationsAgentTool(DIAL_ENDPOINT),
-            WebSearchAgentTool(DIAL_ENDPOINT),
+            get_agent_tool(CalculationsAgentTool, DIAL_ENDPOINT),
+            get_agent_tool(WebSearchAgentTool, DIAL_ENDPOINT),
         ]
 
     # 3. Override the chat_completion method of ChatCompletion, create Choice and call ContentManagementAgent
@@ -47,9 +51,9 @@ class GeneralPurposeAgentApplication(ChatCompletion):
 # ---
 # 4. Create DIALApp with deployment_name `content-managemen-agent` (the same as in the core config) and impl is instance
 #    of the ContentManagementApplication
-app: DIALApp = DIALApp()
 agent_app = GeneralPurposeAgentApplication()
-app.add_chat_completion(deployment_name="content-management-agent", impl=agent_app)
+
+app = create_dial_app(deployment_name="content-management-agent", impl=agent_app)
 
 # 5. Add starter with DIALApp, port is 5002 (see core config)
 if __name__ == "__main__":
@@ -1,7 +1,11 @@
 from datetime import datetime, time, timedelta
+from functools import lru_cache
 from typing import Any, Tuple
+import logging
 import threading
 
+log = logging.getLogger(__name__)
+
 
 class DocumentCache:
     """
@@ -79,7 +83,7 @@ class DocumentCache:
 
             removed_count = len(keys_to_remove)
             if removed_count > 0:
-                print(f"[DocumentCache] Cleaned up {removed_count} expired entries at {now}")
+                log.info("Cleaned up %d expired entries at %s", removed_count, now)
 
             return removed_count
 
@@ -108,7 +112,7 @@ class DocumentCache:
                 name="DocumentCache-Cleanup"
             )
             self._cleanup_thread.start()
-            print("[DocumentCache] Started automatic cleanup thread (runs at midnight)")
+            log.info("Started automatic cleanup thread (runs at midnight)")
 
     def stop_cleanup_task(self) -> None:
         """Stop the background cleanup thread."""
@@ -117,7 +121,7 @@ class DocumentCache:
             self._stop_event.set()
             if self._cleanup_thread and self._cleanup_thread.is_alive():
                 self._cleanup_thread.join(timeout=5)
-            print("[DocumentCache] Stopped automatic cleanup thread")
+            log.info("Stopped automatic cleanup thread")
 
     def size(self) -> int:
         """Return the number of cached entries."""
@@ -126,4 +130,10 @@ class DocumentCache:
 
     def __contains__(self, key: str) -> bool:
         """Check if a key exists in the cache (and is not expired)."""
-        return self.get(key) is not None
\ No newline at end of file
+        return self.get(key) is not None
+
+
+@lru_cache(maxsize=1)
+def get_document_cache() -> DocumentCache:
+    """Return the process-wide document cache (created and started on the first call)."""
+    return DocumentCache.create()
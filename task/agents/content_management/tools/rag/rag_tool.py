@@ -1,8 +1,8 @@
-import json
 from typing import Any
 
 import faiss
 import numpy as np
+import orjson
 from aidial_client import AsyncDial
 from aidial_sdk.chat_completion import Message, Role
 from langchain_text_splitters import RecursiveCharacterTextSplitter
@@ -11,6 +11,7 @@ from sentence_transformers import SentenceTransformer
 from task.tools.base_tool import BaseTool
 from task.tools.models import ToolCallParams, ToolStageConfig
 from task.agents.content_management.tools.rag.document_cache import DocumentCache
+from task.utils.dial_client import API_VERSION, get_dial_client
 from task.utils.dial_file_conent_extractor import DialFileContentExtractor
 
 _SYSTEM_PROMPT = """You are a helpful assistant that answers questions based on provided document context.
@@ -80,7 +81,7 @@ class RagTool(BaseTool):
         }
 
     async def _execute(self, tool_call_params: ToolCallParams) -> str | Message:
-        arguments = json.loads(tool_call_params.tool_call.function.arguments)
+        arguments = orjson.loads(tool_call_params.tool_call.function.arguments)
         request = arguments["request"]
         file_url = arguments["file_url"]
 
@@ -122,11 +123,7 @@ class RagTool(BaseTool):
         stage.append_content(f"```text\n\r{augmented_prompt}\n\r```\n\r")
         stage.append_content("## Response: \n")
 
-        dial_client = AsyncDial(
-            base_url=self.endpoint,
-            api_key=tool_call_params.api_key,
-            api_version='2025-01-01-preview'
-        )
+        dial_client: AsyncDial = get_dial_client(self.endpoint, tool_call_params.api_key)
         chunks_stream = await dial_client.chat.completions.create(
             messages=[
                 {
@@ -140,6 +137,7 @@ class RagTool(BaseTool):
             ],
             deployment_name=self.deployment_name,
             stream=True,
+            api_version=API_VERSION,
         )
 
         content = ''
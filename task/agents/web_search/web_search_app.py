@@ -1,58 +1,57 @@
+import logging
 import os
 
 import uvicorn
-from aidial_sdk import DIALApp
-from aidial_sdk.chat_completion import ChatCompletion, Request, Response
+from aidial_sdk.chat_completion import Request, Response
 
+from task.agents.base_app import BaseAgentApplication, create_dial_app
 from task.agents.web_search.web_search_agent import WebSearchAgent
 from task.tools.base_tool import BaseTool
+from task.tools.deployment.base_agent_tool import get_agent_tool
 from task.tools.deployment.calculations_agent_tool import CalculationsAgentTool
 from task.tools.deployment.content_management_agent_tool import ContentManagementAgentTool
 from task.tools.mcp.mcp_client import MCPClient
 from task.tools.mcp.mcp_tool import MCPTool
 from task.utils.constants import DIAL_ENDPOINT, DEPLOYMENT_NAME
+from task.utils.log import configure_logging
+
+configure_logging()
+log = logging.getLogger(__name__)
 
 _DDG_MCP_URL = os.getenv('DDG_MCP_URL', "http://localhost:8051/mcp")
 
 # 1. Create WebSearchApplication class and extend ChatCompletion
-class WebSearchApplication(ChatCompletion):
-
-    def __init__(self):
-        self.tools: list[BaseTool] = []
+class WebSearchApplication(BaseAgentApplication):
 
     # 2. As a tools for WebSearchAgent you need to provide:
     #   - MCP tools by _DDG_MCP_URL
     #   - CalculationsAgentTool (MAS Mesh)
     #   - ContentManagementAgentTool (MAS Mesh)
     async def _create_tools(self) -> list[BaseTool]:
-        print(f"DDG_MCP_URL {_DDG_MCP_URL}")
+        log.info("DDG_MCP_URL %s", _DDG_MCP_URL)
         tools: list[BaseTool] = [
-            CalculationsAgentTool(DIAL_ENDPOINT),
-            ContentManagementAgentTool(DIAL_ENDPOINT),
+            get_agent_tool(CalculationsAgentTool, DIAL_ENDPOINT),
+            get_agent_tool(ContentManagementAgentTool, DIAL_ENDPOINT),
         ]
         tools.extend(await self._get_mcp_tools(_DDG_MCP_URL))
         return tools
 
     async def _get_mcp_tools(self, url: str) -> list[BaseTool]:
-        try:
-            tools: list[BaseTool] = []
-            mcp_client = await MCPClient.create(url)
-            for mcp_tool_model in await mcp_client.get_tools():
-                tools.append(
-                    MCPTool(
-                        client=mcp_client,
-                        mcp_tool_model=mcp_tool_model,
-                    )
+        # Failures are not logged here, the caller (startup or the first request) reports them
+        tools: list[BaseTool] = []
+        mcp_client = await MCPClient.create(url)
+        for mcp_tool_model in await mcp_client.get_tools():
+            tools.append(
+                MCPTool(
+                    client=mcp_client,
+                    mcp_tool_model=mcp_tool_model,
                 )
-            return tools
-        except Exception as e:
-            print(f"Warning: Could not load MCP tools: {e}")
-            raise e
+            )
+        return tools
 
     # 3. Override the chat_completion method of ChatCompletion, create Choice and call WebSearchAgent
     async def chat_completion(self, request: Request, response: Response) -> None:
-        if not self.tools:
-            self.tools = await self._create_tools()
+        await self.init_tools()
 
         with response.create_single_choice() as choice:
             await WebSearchAgent(
@@ -68,9 +67,10 @@ class WebSearchApplication(ChatCompletion):
 # ---
 # 4. Create DIALApp with deployment_name `web-search-agent` (the same as in the core config) and impl is instance
 #    of the WebSearchApplication
-app: DIALApp = DIALApp()
 agent_app = WebSearchApplication()
-app.add_chat_completion(deployment_name="web-search-agent", impl=agent_app)
+
+
+app = create_dial_app(deployment_name="web-search-agent", impl=agent_app)
 
 # 5. Add starter with DIALApp, port is 5003 (see core config)
 if __name__ == "__main__":
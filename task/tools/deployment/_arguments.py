@@ -0,0 +1,18 @@
+from typing import Any, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+
+class _AgentToolArguments(BaseModel):
+    """Arguments of the tool call to an agent. Extra arguments are propagated to the agent as configuration."""
+
+    model_config = ConfigDict(extra="allow")
+
+    prompt: str
+    propagate_history: Optional[bool] = Field(default=False)
+
+    @field_validator("propagate_history", mode="before")
+    @classmethod
+    def _none_as_false(cls, value: Any) -> Any:
+        # LLM may send `null` for the optional argument, it means the default
+        return False if value is None else value
@@ -0,0 +1,81 @@
+import copy
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from aidial_sdk.chat_completion import Attachment
+
+
+@dataclass
+class _CachedResponse:
+    content: str
+    attachments: list[Attachment]
+    state: Any
+    timestamp: datetime
+
+
+class _AgentResponseCache:
+    """
+    LRU cache of the called agents responses.
+    Entries expire after `ttl`, since responses of the called agents become outdated.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: timedelta = timedelta(minutes=15)):
+        self._cache: OrderedDict[bytes, _CachedResponse] = OrderedDict()
+        self._maxsize = maxsize
+        self._ttl = ttl
+
+    @staticmethod
+    def key(*parts: Any) -> bytes:
+        """Build the cache key as a digest of JSON-serialized parts."""
+        # stdlib json is used since parts may carry integers out of the 64-bit range (e.g. in agent configuration)
+        return hashlib.blake2b(json.dumps(parts, sort_keys=True, default=str).encode()).digest()
+
+    def get(self, key: bytes) -> Optional[_CachedResponse]:
+        """
+        Retrieve a cached response.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Copy of cached response if found and not expired, None otherwise
+        """
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if datetime.now() - entry.timestamp >= self._ttl:
+            del self._cache[key]
+            return None
+
+        self._cache.move_to_end(key)
+        # State is copied since the caller extends the tool call history from it
+        return _CachedResponse(
+            content=entry.content,
+            attachments=list(entry.attachments),
+            state=copy.deepcopy(entry.state),
+            timestamp=entry.timestamp,
+        )
+
+    def set(self, key: bytes, content: str, attachments: list[Attachment], state: Any) -> None:
+        """
+        Store a response in the cache, the least recently used entry is evicted if the cache is full.
+
+        Args:
+            key: Cache key
+            content: Response content
+            attachments: Response attachments
+            state: Response state
+        """
+        self._cache[key] = _CachedResponse(
+            content=content,
+            attachments=list(attachments),
+            state=copy.deepcopy(state),
+            timestamp=datetime.now(),
+        )
+        self._cache.move_to_end(key)
+        if len(self._cache) > self._maxsize:
+            self._cache.popitem(last=False)
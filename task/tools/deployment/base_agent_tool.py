@@ -1,19 +1,68 @@
-import json
 from abc import ABC, abstractmethod
-from copy import deepcopy
-from typing import Any
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Optional, TypeVar
 
 from aidial_client import AsyncDial
 from aidial_sdk.chat_completion import Message, Role, CustomContent, Stage, Attachment
 from pydantic import StrictStr
 
 from task.tools.base_tool import BaseTool
+from task.tools.deployment._arguments import _AgentToolArguments
+from task.tools.deployment._response_cache import _AgentResponseCache
 from task.tools.models import ToolCallParams
+from task.utils.constants import AGENT_RESPONSE_CACHE
+from task.utils.dial_client import API_VERSION, get_dial_client
 from task.utils.stage import StageProcessor
 
 
+def _construct_attachment(fields: dict[str, Any]) -> Attachment:
+    # Validation is skipped: attachment is validated anyway when Choice/Stage sends it as a chunk. None fields are
+    # dropped to keep defaults of the Attachment
+    return Attachment.construct(**{k: v for k, v in fields.items() if v is not None})
+
+
+def _append_stage_name(stage: Stage, name: str) -> None:
+    stage.append_name(name)
+
+
+def _append_stage_content(stage: Stage, content: str) -> None:
+    stage.append_content(content)
+
+
+def _add_stage_attachments(stage: Stage, attachments: list[dict[str, Any]]) -> None:
+    for attachment in attachments:
+        stage.add_attachment(_construct_attachment(attachment))
+
+
+# Handlers of the propagated stage fields, the key is the field name in the stage chunk. `status` is not here: it is
+# handled after the other fields, since the stage is closed on `completed`
+_STAGE_UPDATE_HANDLERS: dict[str, Callable[[Stage, Any], None]] = {
+    "name": _append_stage_name,
+    "content": _append_stage_content,
+    "attachments": _add_stage_attachments,
+}
+
+
+@dataclass(slots=True)
+class _StreamedResponse:
+    """Aggregates streamed response of the called agent, CustomContent is built from it once after streaming."""
+
+    content_parts: list[str] = field(default_factory=list)
+    attachments: list[Any] = field(default_factory=list)
+    state: Any = None
+    # Stage indexes are small sequential ints, so stage is stored in the list by its index
+    stages: list[Optional[Stage]] = field(default_factory=list)
+
+
 class BaseAgentTool(BaseTool, ABC):
 
+    # Responses of one-shot calls, shared by all agent tools (deployment name is a part of the key)
+    _response_cache = _AgentResponseCache(maxsize=1024)
+    # Whether one-shot responses of this agent may be replayed from cache (when AGENT_RESPONSE_CACHE is enabled),
+    # time-sensitive agents should disable it
+    cache_responses: bool = True
+
     def __init__(self, endpoint: str):
         self.endpoint = endpoint
 
@@ -27,10 +76,31 @@ class BaseAgentTool(BaseTool, ABC):
         #   - `prompt` (the request to agent)
         #   - `propagate_history`, boolean whether we need to propagate the history of communication with called agent
         stage = tool_call_params.stage
-        arguments = json.loads(tool_call_params.tool_call.function.arguments)
-        if prompt := arguments.get("prompt"):
-            stage.append_name(f": {prompt}")
-            del arguments["prompt"]
+        arguments = _AgentToolArguments.model_validate_json(tool_call_params.tool_call.function.arguments)
+        messages = self._prepare_messages(tool_call_params, arguments)
+        if arguments.prompt:
+            stage.append_name(f": {arguments.prompt}")
+
+        # One-shot call depends only on the request, so the same request in the same conversation is replayed from
+        # cache. The conversation id is used instead of the api key: DIAL Core issues a new api key per application
+        # call, so it doesn't identify the user. Calls with propagated history are context-sensitive and never cached.
+        # Cache is opt-in: regenerate and user retries come with the same conversation id and would get the replay.
+        cache_key = None
+        if AGENT_RESPONSE_CACHE and self.cache_responses and not arguments.propagate_history:
+            cache_key = _AgentResponseCache.key(
+                self.deployment_name, tool_call_params.conversation_id, messages, arguments.model_extra
+            )
+            if cached := self._response_cache.get(cache_key):
+                stage.append_content(cached.content)
+                for attachment in cached.attachments:
+                    tool_call_params.choice.add_attachment(attachment)
+
+                return Message(
+                    role=Role.TOOL,
+                    content=StrictStr(cached.content),
+                    custom_content=CustomContent(attachments=cached.attachments, state=cached.state),
+                    tool_call_id=StrictStr(tool_call_params.tool_call.id),
+                )
 
         # 2. Use AsyncDial (api_version='2025-01-01-preview'), call the agent with steaming option.
         #    Here, actually, you can find one of the most powerful features of DIAL - Unified protocol. All the
@@ -42,18 +112,15 @@ class BaseAgentTool(BaseTool, ABC):
         #    the same way we are working with applications, the application that makes a call provide the conversation history.
         #    ⚠️ To provide proper message history you need to implement the `_prepare_messages` method!
         #    ⚠️ Don't forget to include as extra_headers `x-conversation-id`!
-        client: AsyncDial = AsyncDial(
-            base_url=self.endpoint,
-            api_key=tool_call_params.api_key,
-            api_version='2025-01-01-preview'
-        )
+        client: AsyncDial = get_dial_client(self.endpoint, tool_call_params.api_key)
         chunks = await client.chat.completions.create(
-            messages=self._prepare_messages(tool_call_params),
+            messages=messages,
             stream=True,
             deployment_name=self.deployment_name,
+            api_version=API_VERSION,
             extra_body={
                 "custom_fields": {
-                    "configuration": {**arguments}
+                    "configuration": {**(arguments.model_extra or {})}
                 }
             },
             extra_headers={
@@ -61,84 +128,104 @@ class BaseAgentTool(BaseTool, ABC):
             },
         )
 
-        # 3. Prepare:
-        #   - `content` variable, here we will collect the streamed content
-        #   - `custom_content: CustomContent` variable, here we will collect variable CustomContent from agent response
-        #   - `stages_map: dict[int, Stage]` variable, here will be persisted propagated stages
-        content = ''
-        custom_content: CustomContent = CustomContent(attachments=[])
-        stages_map: dict[int, Stage] = {}
+        # 3. Prepare `streamed: _StreamedResponse` variable, here we will collect:
+        #   - `content_parts`, the streamed content (joined once after streaming)
+        #   - `attachments` and `state` from agent response CustomContent
+        #   - `stages`, here will be persisted propagated stages
+        streamed = _StreamedResponse()
+        content_parts = streamed.content_parts
+        stages_list = streamed.stages
 
         # 4. Iterate through chunks and:
         #   - Stream content to the Stage (from tool_call_params) for this tool call
         #   - For custom_content:
-        #       - set `state` from response CustomContent to the `custom_content`
+        #       - set `state` from response CustomContent to the `streamed`
         #       - in attachments are found propagate them to choice
         #       - Optional:
-        #           Stages propagation: convert response CustomContent to dict and if stages are present:
+        #           Stages propagation: if stages are present in response CustomContent (they are not declared in the
+        #           client model, so they come as raw dicts in extra fields):
         #           - each Stage has it is `index`, it will be returned in each chunk. If stage by such index is present
-        #             in `stages_map` then you need to propagate content, otherwise you need to create stage
+        #             in `streamed.stages` then you need to propagate content, otherwise you need to create stage
         #           - propagate stage name from response to propagated stage name, the same story for `content` and `attachments`
         #           - if response stage has `status = completed` - we need to close such stage
+        choice = tool_call_params.choice
         async for chunk in chunks:
-            if chunk.choices and len(chunk.choices) > 0:
-                delta = chunk.choices[0].delta
-                if delta and delta.content:
-                    stage.append_content(delta.content)
-                    content += delta.content
-                if cc := delta.custom_content:
-                    if cc.attachments:
-                        custom_content.attachments.extend(cc.attachments)
-
-                    if cc.state:
-                        custom_content.state = cc.state
-
-                    cc_dict = cc.dict(exclude_none=True)
-                    if stages := cc_dict.get("stages"):
-                        for stg in stages:
-                            idx = stg["index"]
-                            if opened_stg := stages_map.get(idx):
-                                if stg_name := stg.get("name"):
-                                    opened_stg.append_name(stg_name)
-                                elif stg_content := stg.get("content"):
-                                    opened_stg.append_content(stg_content)
-                                elif stg_attachments := stg.get("attachments"):
-                                    for stg_attachment in stg_attachments:
-                                        opened_stg.add_attachment(Attachment(**stg_attachment))
-                                elif stg.get("status") and stg.get("status") == 'completed':
-                                    StageProcessor.close_stage_safely(stages_map[idx])
-                            else:
-                                stages_map[idx] = StageProcessor.open_stage(tool_call_params.choice, stg.get("name"))
+            # Fields are read once into locals, attribute access of the response models is not free in this loop
+            choices = chunk.choices
+            if not choices:
+                continue
+            delta = choices[0].delta
+            if delta is None:
+                continue
+
+            if delta_content := delta.content:
+                stage.append_content(delta_content)
+                content_parts.append(delta_content)
+
+            cc = delta.custom_content
+            if cc is None:
+                continue
+
+            if cc_attachments := cc.attachments:
+                streamed.attachments.extend(cc_attachments)
+
+            if cc_state := cc.state:
+                streamed.state = cc_state
+
+            if stages := getattr(cc, "stages", None):
+                for stg in stages:
+                    idx = stg["index"]
+                    if opened_stg := (stages_list[idx] if idx < len(stages_list) else None):
+                        # Stage chunk is iterated once, only the fields present in it are handled
+                        for key, value in stg.items():
+                            if value and (handler := _STAGE_UPDATE_HANDLERS.get(key)):
+                                handler(opened_stg, value)
+                        if stg.get("status") == 'completed':
+                            StageProcessor.close_stage_safely(opened_stg)
+                    else:
+                        if idx >= len(stages_list):
+                            stages_list.extend([None] * (idx + 1 - len(stages_list)))
+                        stages_list[idx] = StageProcessor.open_stage(choice, stg.get("name"))
 
         # 5. Ensure that stages are closed (just iterate through them and close safely with StageProcessor)
-        for stg in stages_map.values():
-            StageProcessor.close_stage_safely(stg)
+        for stg in stages_list:
+            if stg:
+                StageProcessor.close_stage_safely(stg)
 
         # 6. Return Tool message
         #    ⚠️ Remember, tool message must have tool call id, also don't forget to add `custom_content` since we need
         #       to save properly tool history to choice state later
-        for attachment in custom_content.attachments:
-            tool_call_params.choice.add_attachment(
-                Attachment(**attachment.dict(exclude_none=True))
-            )
+        attachments = [
+            _construct_attachment(attachment.__dict__)
+            for attachment in streamed.attachments
+        ]
+        for attachment in attachments:
+            choice.add_attachment(attachment)
+
+        content = ''.join(content_parts)
+        # Empty response is usually a failure of the called agent, it is not cached so the retry reaches the agent
+        if cache_key and content:
+            self._response_cache.set(cache_key, content, attachments, streamed.state)
 
         return Message(
             role=Role.TOOL,
             content=StrictStr(content),
-            custom_content=custom_content,
+            custom_content=CustomContent(attachments=attachments, state=streamed.state),
             tool_call_id=StrictStr(tool_call_params.tool_call.id),
         )
 
-    def _prepare_messages(self, tool_call_params: ToolCallParams) -> list[dict[str, Any]]:
+    def _prepare_messages(self, tool_call_params: ToolCallParams, arguments: _AgentToolArguments) -> list[dict[str, Any]]:
         # In here we will manage the context for the agent that we are going to call.
         # We support two modes:
         #   - One-shot: only one user message to the Agent with prompt
         #   - Propagate whole Per-To-Per history between this Agent and the Agent that we are calling
         # ---
-        # 1. Get: `prompt` and `propagate_history` params from tool call
-        arguments = json.loads(tool_call_params.tool_call.function.arguments)
-        prompt = arguments["prompt"]
-        propagate_history = bool(arguments.get("propagate_history", False))
+        # 1. Get: `prompt` and `propagate_history` params from tool call (arguments are already parsed in `_execute`)
+        prompt = arguments.prompt
+        propagate_history = arguments.propagate_history
+        history = tool_call_params.messages
+        last_custom_content = history[-1].custom_content
+        last_custom_content_dump = last_custom_content.dict(exclude_none=True) if last_custom_content else None
 
         # 2. Prepare empty `messages` array, here we will collect history with Per-To-Per communication between this
         #    agent and the agent that we are colling
@@ -149,31 +236,45 @@ class BaseAgentTool(BaseTool, ABC):
         #   from assistant and in custom content present state and in this state present history for this `self.name`
         #   (self.name is the key in state to get tool_call_history from the agent that we are going to call), then
         #   firstly add to `messages` user message that is going before the assistant message and then add assistant
-        #   message. For assistant message you need to make a deepcopy and refactor the state for copied message, instead
-        #   of the whole state you need to get from the state value by `self.name`
+        #   message. For assistant message you need to dump it to dict and refactor the state in the dumped message,
+        #   instead of the whole state you need to get from the state value by `self.name` (no deepcopy of the model)
         if propagate_history:
-            for idx in range(len(tool_call_params.messages)):
-                msg = tool_call_params.messages[idx]
-                if msg.role == Role.ASSISTANT:
-                    if msg.custom_content and msg.custom_content.state:
-                        msg_state = msg.custom_content.state
-                        if msg_state.get(self.name):
-                            # 1. add user request (user message is always before assistant message)
-                            messages.append(tool_call_params.messages[idx - 1].dict(exclude_none=True))
-
-                            # 2. Copy assistant message
-                            copied_msg = deepcopy(msg)
-                            copied_msg.custom_content.state = msg_state.get(self.name)
-                            messages.append(copied_msg.dict(exclude_none=True))
+            # Pre-scan for the assistant messages with history of called agent, only they (and user messages before
+            # them) are dumped
+            name = self.name
+            indices = [
+                idx for idx, msg in enumerate(history)
+                if msg.role == Role.ASSISTANT
+                and msg.custom_content
+                and msg.custom_content.state
+                and msg.custom_content.state.get(name)
+            ]
+            for idx in indices:
+                msg = history[idx]
+                # 1. add user request (user message is always before assistant message)
+                messages.append(history[idx - 1].dict(exclude_none=True))
+
+                # 2. Dump assistant message and replace the state with the state of called agent
+                msg_dict = msg.dict(exclude_none=True)
+                msg_dict["custom_content"]["state"] = msg.custom_content.state[name]
+                messages.append(msg_dict)
 
         # 4. Lastly, add the user message with `prompt` and don't forget about the custom_content
-        custom_content = tool_call_params.messages[-1].custom_content
         messages.append(
             {
                 "role": "user",
                 "content": prompt,
-                "custom_content": custom_content.dict(exclude_none=True) if custom_content else None,
+                "custom_content": last_custom_content_dump,
             }
         )
 
-        return messages
\ No newline at end of file
+        return messages
+
+
+_AgentToolT = TypeVar("_AgentToolT", bound=BaseAgentTool)
+
+
+@lru_cache(maxsize=None)
+def get_agent_tool(tool_cls: type[_AgentToolT], endpoint: str) -> _AgentToolT:
+    # Agent tools are stateless, so one instance per tool class and endpoint is shared by all agents in the process
+    return tool_cls(endpoint)
@@ -5,6 +5,9 @@ from task.tools.deployment.base_agent_tool import BaseAgentTool
 
 class WebSearchAgentTool(BaseAgentTool):
 
+    # Search results become outdated, so responses are never replayed from cache
+    cache_responses = False
+
     # Provide implementations of deployment_name (in core config), name, description and parameters.
     # Don't forget to mark them as @property
     # Parameters:
@@ -1,3 +1,4 @@
+import logging
 from typing import Optional, Any
 
 from mcp import ClientSession
@@ -7,6 +8,8 @@ from pydantic import AnyUrl
 
 from task.tools.mcp.mcp_tool_model import MCPToolModel
 
+log = logging.getLogger(__name__)
+
 
 class MCPClient:
     """Handles MCP server connection and tool execution"""
@@ -106,13 +109,13 @@ class MCPClient:
             if self._session_context:
                 await self._session_context.__aexit__(None, None, None)
         except Exception as e:
-            print(f"Warning: Error closing session context: {e}")
+            log.warning("Error closing session context: %s", e)
 
         try:
             if self._streams_context:
                 await self._streams_context.__aexit__(None, None, None)
         except Exception as e:
-            print(f"Warning: Error closing streams context: {e}")
+            log.warning("Error closing streams context: %s", e)
 
         finally:
             # Clean up references
@@ -2,6 +2,9 @@ import os
 
 DIAL_ENDPOINT = os.getenv('DIAL_ENDPOINT', "http://localhost:8080")
 DEPLOYMENT_NAME = os.getenv('DEPLOYMENT_NAME', 'gpt-4o')
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+# Opt-in replay of one-shot agent tool responses, see BaseAgentTool.cache_responses
+AGENT_RESPONSE_CACHE = os.getenv('AGENT_RESPONSE_CACHE', 'false').lower() == 'true'
 
 TOOL_CALL_HISTORY_KEY = "tool_call_history"
 CUSTOM_CONTENT = "custom_content"
\ No newline at end of file
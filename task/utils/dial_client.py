@@ -0,0 +1,47 @@
+import os
+from functools import lru_cache
+
+import httpx
+from aidial_client import AsyncDial, AsyncDialClientPool
+from aidial_client._constants import DEFAULT_CONNECTION_LIMITS, DEFAULT_TIMEOUT
+
+API_VERSION = '2025-01-01-preview'
+
+# The limits are shared by the whole process: each streamed call to a model or agent (including nested agent calls and
+# all the agents in the combined app) holds a connection until the stream ends
+_CONNECTION_LIMITS = httpx.Limits(
+    max_connections=int(os.getenv('DIAL_MAX_CONNECTIONS', DEFAULT_CONNECTION_LIMITS.max_connections)),
+    max_keepalive_connections=int(
+        os.getenv('DIAL_MAX_KEEPALIVE_CONNECTIONS', DEFAULT_CONNECTION_LIMITS.max_keepalive_connections)
+    ),
+    keepalive_expiry=30,
+)
+# When the pool is exhausted the request fails after the short `pool` timeout instead of waiting for the read timeout
+_TIMEOUT = httpx.Timeout(
+    timeout=DEFAULT_TIMEOUT.read,
+    connect=DEFAULT_TIMEOUT.connect,
+    pool=float(os.getenv('DIAL_POOL_TIMEOUT', 10.0)),
+)
+
+
+@lru_cache(maxsize=1)
+def _get_client_pool() -> AsyncDialClientPool:
+    return AsyncDialClientPool(connection_limits=_CONNECTION_LIMITS)
+
+
+def get_dial_client(endpoint: str, api_key: str) -> AsyncDial:
+    """
+    Returns AsyncDial client for the endpoint and api key. The client is created per call (DIAL Core provides new api
+    key for each request, so clients are not cached), it is cheap since all the clients share one HTTP connection
+    pool and connections to DIAL Core are reused between requests and tool calls.
+    ⚠️ Clients from the pool don't have default api version, provide `api_version` in the request.
+    """
+    return _get_client_pool().create_client(base_url=endpoint, api_key=api_key, timeout=_TIMEOUT)
+
+
+async def close_dial_clients() -> None:
+    """Closes the shared HTTP connection pool, should be called on application shutdown."""
+    if _get_client_pool.cache_info().currsize:
+        # AsyncDialClientPool has no public close method, relies on the private attribute of aidial-client==0.3.0
+        await _get_client_pool()._internal_http_client.aclose()
+        _get_client_pool.cache_clear()
@@ -1,4 +1,5 @@
 import io
+import logging
 from pathlib import Path
 
 import pdfplumber
@@ -6,6 +7,8 @@ import pandas as pd
 from aidial_client import Dial
 from bs4 import BeautifulSoup
 
+log = logging.getLogger(__name__)
+
 
 class DialFileContentExtractor:
 
@@ -62,5 +65,5 @@ class DialFileContentExtractor:
                 return file_content.decode('utf-8', errors='ignore')
 
         except Exception as e:
-            print(f"Error extracting text from {filename}: {str(e)}")
+            log.error("Error extracting text from %s: %s", filename, e, exc_info=e)
             return ""
\ No newline at end of file
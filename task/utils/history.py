@@ -1,4 +1,3 @@
-import copy
 from typing import Any
 
 from aidial_sdk.chat_completion import Message, Role
@@ -28,9 +27,8 @@ def unpack_messages(messages: list[Message], state_history: list[dict[str, Any]]
                             else:
                                 result.append(history_msg)
 
-                    msg = copy.deepcopy(message)
-                    msg.custom_content = None
-                    result.append(msg.dict(exclude_none=True))
+                    # Dump without custom content instead of deepcopy of the whole message with its state
+                    result.append(message.dict(exclude_none=True, exclude={"custom_content"}))
         else:
             attachments_urls_content = ''
             if message.custom_content and message.custom_content.attachments:
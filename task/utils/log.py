@@ -0,0 +1,37 @@
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+from task.utils.constants import LOG_LEVEL
+
+# `__main__` is the logger of the app module started as a script
+_LOGGER_NAMES = ("task", "__main__")
+_LOG_FORMAT = "%(levelname)s: | %(asctime)s | %(name)s | %(message)s"
+
+_listener: QueueListener | None = None
+
+
+def configure_logging() -> None:
+    """
+    Configures loggers of the `task` package. Records are put to a queue and written by a QueueListener thread, so
+    the event loop is never blocked by log I/O.
+    """
+    global _listener
+    if _listener is not None:
+        return  # Already configured
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(_LOG_FORMAT))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, stream_handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    queue_handler = QueueHandler(log_queue)
+    for name in _LOGGER_NAMES:
+        logger = logging.getLogger(name)
+        logger.addHandler(queue_handler)
+        logger.setLevel(LOG_LEVEL)
+        logger.propagate = False
@@ -1,7 +1,10 @@
+import logging
 from typing import Optional
 
 from aidial_sdk.chat_completion import Choice, Stage
 
+log = logging.getLogger(__name__)
+
 
 class StageProcessor:
 
@@ -17,4 +20,4 @@ class StageProcessor:
             if not stage._closed:
                 stage.close()
         except Exception as e:
-            print("⚠️ Unable to close stage. ", e)
+            log.warning("Unable to close stage: %s", e, exc_info=e)
@@ -0,0 +1,34 @@
+import json
+from typing import Callable, Optional
+from unittest.mock import MagicMock
+
+import pytest
+from aidial_sdk.chat_completion import FunctionCall, Message, ToolCall
+
+from task.tools.models import ToolCallParams
+
+
+@pytest.fixture
+def make_tool_call_params() -> Callable[..., ToolCallParams]:
+    """Builds ToolCallParams for the tool call with `arguments`, stage and choice are mocks."""
+
+    def make(
+            name: str,
+            arguments: dict,
+            conversation_id: str = "conversation_id",
+            messages: Optional[list[Message]] = None,
+    ) -> ToolCallParams:
+        return ToolCallParams(
+            tool_call=ToolCall(
+                id="call_1",
+                type="function",
+                function=FunctionCall(name=name, arguments=json.dumps(arguments)),
+            ),
+            stage=MagicMock(),
+            choice=MagicMock(),
+            api_key="api_key",
+            conversation_id=conversation_id,
+            messages=messages or [],
+        )
+
+    return make
@@ -0,0 +1,16 @@
+from task.tools.deployment._arguments import _AgentToolArguments
+
+
+def test_propagate_history_defaults_to_false():
+    assert _AgentToolArguments.model_validate_json('{"prompt": "x"}').propagate_history is False
+
+
+def test_null_propagate_history_is_false():
+    arguments = _AgentToolArguments.model_validate_json('{"prompt": "x", "propagate_history": null}')
+    assert arguments.propagate_history is False
+
+
+def test_extra_arguments_are_kept():
+    arguments = _AgentToolArguments.model_validate_json('{"prompt": "x", "propagate_history": true, "n": 1}')
+    assert arguments.propagate_history is True
+    assert arguments.model_extra == {"n": 1}
@@ -0,0 +1,138 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Callable, Optional
+
+import pytest
+from aidial_sdk.chat_completion import Message, Role
+
+from task.tools.deployment import base_agent_tool
+from task.tools.deployment._response_cache import _AgentResponseCache
+from task.tools.deployment.base_agent_tool import BaseAgentTool
+from task.tools.deployment.calculations_agent_tool import CalculationsAgentTool
+from task.tools.deployment.web_search_agent_tool import WebSearchAgentTool
+
+
+class _FakeCompletions:
+
+    def __init__(self):
+        self.calls = 0
+        self.content: Optional[str] = None
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        return self._stream(f"answer {self.calls}" if self.content is None else self.content)
+
+    @staticmethod
+    async def _stream(content: str):
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content, custom_content=None))])
+
+
+@pytest.fixture
+def completions(monkeypatch) -> _FakeCompletions:
+    completions = _FakeCompletions()
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    monkeypatch.setattr(base_agent_tool, "get_dial_client", lambda endpoint, api_key: client)
+    monkeypatch.setattr(base_agent_tool.BaseAgentTool, "_response_cache", _AgentResponseCache())
+    monkeypatch.setattr(base_agent_tool, "AGENT_RESPONSE_CACHE", True)
+    return completions
+
+
+@pytest.fixture
+def call(make_tool_call_params) -> Callable[..., Message]:
+
+    def _call(arguments: dict, tool: Optional[BaseAgentTool] = None, **kwargs) -> Message:
+        tool = tool or CalculationsAgentTool("http://localhost")
+        params = make_tool_call_params(
+            tool.name, arguments, messages=[Message(role=Role.USER, content="hi")], **kwargs
+        )
+        return asyncio.run(tool._execute(params))
+
+    return _call
+
+
+def test_same_request_is_replayed_from_cache(completions, call):
+    first = call({"prompt": "2+2"})
+    second = call({"prompt": "2+2"})
+
+    assert completions.calls == 1
+    assert first.content == second.content == "answer 1"
+
+
+def test_cache_miss_on_different_prompt_or_conversation(completions, call):
+    call({"prompt": "2+2"})
+    call({"prompt": "3+3"})
+    call({"prompt": "2+2"}, conversation_id="other_conversation")
+
+    assert completions.calls == 3
+
+
+def test_propagated_history_is_never_cached(completions, call):
+    call({"prompt": "2+2", "propagate_history": True})
+    call({"prompt": "2+2", "propagate_history": True})
+
+    assert completions.calls == 2
+
+
+def test_cache_is_disabled_by_default(completions, call, monkeypatch):
+    monkeypatch.setattr(base_agent_tool, "AGENT_RESPONSE_CACHE", False)
+    call({"prompt": "2+2"})
+    call({"prompt": "2+2"})
+
+    assert completions.calls == 2
+
+
+def test_web_search_agent_is_never_cached(completions, call):
+    tool = WebSearchAgentTool("http://localhost")
+    call({"prompt": "news"}, tool=tool)
+    call({"prompt": "news"}, tool=tool)
+
+    assert completions.calls == 2
+
+
+def test_empty_response_is_not_cached(completions, call):
+    completions.content = ""
+    call({"prompt": "2+2"})
+    call({"prompt": "2+2"})
+
+    assert completions.calls == 2
+
+
+def test_big_integers_in_configuration(completions, call):
+    arguments = {"prompt": "x", "n": 123456789012345678901234567890}
+    assert call(arguments).content == "answer 1"
+    assert call(arguments).content == "answer 1"
+    assert completions.calls == 1
+
+
+def test_entry_expires_after_ttl():
+    cache = _AgentResponseCache(ttl=timedelta(minutes=15))
+    key = cache.key("deployment", "conversation_id", [])
+    cache.set(key, "content", [], None)
+    assert cache.get(key).content == "content"
+
+    cache._cache[key].timestamp = datetime.now() - timedelta(minutes=15)
+    assert cache.get(key) is None
+    assert key not in cache._cache
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = _AgentResponseCache(maxsize=2)
+    cache.set(b"a", "a", [], None)
+    cache.set(b"b", "b", [], None)
+    cache.get(b"a")
+    cache.set(b"c", "c", [], None)
+
+    assert cache.get(b"b") is None
+    assert cache.get(b"a").content == "a"
+    assert cache.get(b"c").content == "c"
+
+
+def test_state_is_copied():
+    cache = _AgentResponseCache()
+    state = {"tool_call_history": []}
+    cache.set(b"key", "content", [], state)
+    state["tool_call_history"].append("stored")
+    cache.get(b"key").state["tool_call_history"].append("read")
+
+    assert cache.get(b"key").state == {"tool_call_history": []}
@@ -0,0 +1,15 @@
+import asyncio
+
+from task.agents.calculations.tools.simple_calculator_tool import SimpleCalculatorTool
+
+
+def test_add(make_tool_call_params):
+    params = make_tool_call_params("simple_calculator", {"a": 2, "b": 3, "operation": "add"})
+    assert asyncio.run(SimpleCalculatorTool()._execute(params)) == 5
+
+
+def test_big_integers_are_exact(make_tool_call_params):
+    params = make_tool_call_params("simple_calculator", {"a": 2 ** 70, "b": 1, "operation": "add"})
+    result = asyncio.run(SimpleCalculatorTool()._execute(params))
+    assert result == 1180591620717411303425
+    assert isinstance(result, int)